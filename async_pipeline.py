@@ -0,0 +1,152 @@
+"""asyncio pipelines that encode/decode streams of objects without blocking the event loop.\n
+The big-int work runs batch-wise in an executor (the loop's default thread pool if none is given).
+Bounded queues between the stages give backpressure: a slow consumer stops the pipeline from
+pulling more items from its source.\n
+A ProcessPoolExecutor should use the "spawn" or "forkserver" start method:
+forked workers inherit open sockets and keep connections from closing."""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Callable
+
+from bij_type import BijType
+
+FRAME_HEADER_SIZE = 4 # bytes of the big-endian length prefix of each code
+MAX_FRAME_SIZE = 1 << 24 # default limit (in bytes) for a code read from a stream
+
+
+# ================================
+# module level, so the batches can be sent to a ProcessPoolExecutor
+# (which requires `cls` to be importable)
+def encode_batch(cls: type[BijType], objects: list) -> list[int]:
+    return [cls.encode(obj) for obj in objects]
+
+def decode_batch(cls: type[BijType], codes: list[int]) -> list:
+    return [cls.decode(code) for code in codes]
+
+async def batched(source: AsyncIterable, size: int) -> AsyncIterator[list]:
+    batch = []
+    async for item in source:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+_DONE = object()
+
+async def pipeline(
+        work: Callable[[type[BijType], list], list],
+        cls: type[BijType],
+        source: AsyncIterable,
+        *,
+        batch_size: int,
+        max_pending: int,
+        executor: Executor | None
+        ) -> AsyncIterator:
+    """runs `work(cls, batch)` in the executor for consecutive batches of `source`
+    and yields the results in order.\n
+    At most `max_pending` batches are in flight: a slot is taken before a batch is submitted
+    and given back once all of its results have been yielded."""
+    if batch_size < 1 or max_pending < 1:
+        raise ValueError("batch_size and max_pending must be at least 1!")
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_pending)
+    pending: asyncio.Queue = asyncio.Queue() # bounded by `slots`
+
+    async def produce():
+        try:
+            async for batch in batched(source, batch_size):
+                await slots.acquire()
+                pending.put_nowait(loop.run_in_executor(executor, work, cls, batch))
+        except Exception as e:
+            failed = loop.create_future()
+            failed.set_exception(e)
+            pending.put_nowait(failed)
+        pending.put_nowait(_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (future := await pending.get()) is not _DONE:
+            for result in await future:
+                yield result
+            slots.release()
+    finally:
+        producer.cancel()
+        while not pending.empty():
+            future = pending.get_nowait()
+            if future is not _DONE:
+                future.cancel()
+
+def encode_stream(
+        cls: type[BijType],
+        objects: AsyncIterable,
+        *,
+        batch_size: int = 256,
+        max_pending: int = 4,
+        executor: Executor | None = None
+        ) -> AsyncIterator[int]:
+    """codes of the objects, in order"""
+    return pipeline(encode_batch, cls, objects,
+                    batch_size=batch_size, max_pending=max_pending, executor=executor)
+
+def decode_stream(
+        cls: type[BijType],
+        codes: AsyncIterable[int],
+        *,
+        batch_size: int = 256,
+        max_pending: int = 4,
+        executor: Executor | None = None
+        ) -> AsyncIterator:
+    """decoded objects, in order"""
+    return pipeline(decode_batch, cls, codes,
+                    batch_size=batch_size, max_pending=max_pending, executor=executor)
+
+
+# ================================
+# Length-prefixed byte streams: 4-byte big-endian length, then the code as big-endian bytes
+def code_to_frame(code: int) -> bytes:
+    data = code.to_bytes((code.bit_length() + 7) // 8, "big")
+    return len(data).to_bytes(FRAME_HEADER_SIZE, "big") + data
+
+async def write_codes(writer: asyncio.StreamWriter, codes: AsyncIterable[int], *, drain_every: int = 256) -> int:
+    """writes the codes as length-prefixed frames; returns the number of codes written.\n
+    Does not close the writer."""
+    count = 0
+    async for code in codes:
+        writer.write(code_to_frame(code))
+        count += 1
+        if count % drain_every == 0:
+            await writer.drain()
+    await writer.drain()
+    return count
+
+async def read_codes(reader: asyncio.StreamReader, *, max_frame_size: int | None = MAX_FRAME_SIZE) -> AsyncIterator[int]:
+    """yields the codes of length-prefixed frames until the stream ends.\n
+    A frame whose header announces more than `max_frame_size` bytes (None: no limit)
+    raises a ValueError before anything of it is read."""
+    while True:
+        try:
+            header = await reader.readexactly(FRAME_HEADER_SIZE)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return
+            raise
+        length = int.from_bytes(header, "big")
+        if max_frame_size is not None and length > max_frame_size:
+            raise ValueError(f"Frame of {length} bytes exceeds max_frame_size={max_frame_size}!")
+        yield int.from_bytes(await reader.readexactly(length), "big")
+
+async def write_objects(writer: asyncio.StreamWriter, cls: type[BijType], objects: AsyncIterable, **pipeline_kwargs: Any) -> int:
+    """encodes the objects (see `encode_stream`) and writes their codes to the stream"""
+    return await write_codes(writer, encode_stream(cls, objects, **pipeline_kwargs))
+
+def read_objects(
+        reader: asyncio.StreamReader,
+        cls: type[BijType],
+        *,
+        max_frame_size: int | None = MAX_FRAME_SIZE,
+        **pipeline_kwargs: Any
+        ) -> AsyncIterator:
+    """reads codes from the stream (see `read_codes`) and decodes them (see `decode_stream`)"""
+    return decode_stream(cls, read_codes(reader, max_frame_size=max_frame_size), **pipeline_kwargs)
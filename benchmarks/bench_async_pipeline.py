@@ -0,0 +1,69 @@
+"""Loopback throughput of the asyncio codec pipeline.\n
+A server decodes the objects it receives and sends them back re-encoded;
+the client streams objects to it and decodes the replies.\n
+Run from the repository root: `python -m benchmarks.bench_async_pipeline`"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import perf_counter
+
+from async_pipeline import read_objects, write_objects
+from btypes.numeric import IntPair
+
+
+async def aiter_list(items: list):
+    for item in items:
+        yield item
+
+async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, **pipeline_kwargs):
+    await write_objects(writer, IntPair, read_objects(reader, IntPair, **pipeline_kwargs), **pipeline_kwargs)
+    writer.close()
+    await writer.wait_closed()
+
+async def roundtrip(objects: list, **pipeline_kwargs) -> float:
+    server = await asyncio.start_server(
+        lambda r, w: serve(r, w, **pipeline_kwargs), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    start = perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def send():
+        await write_objects(writer, IntPair, aiter_list(objects), **pipeline_kwargs)
+        writer.write_eof()
+
+    sender = asyncio.create_task(send())
+    received = [obj async for obj in read_objects(reader, IntPair, **pipeline_kwargs)]
+    await sender
+    seconds = perf_counter() - start
+
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    assert received == objects
+    return seconds
+
+def sync_roundtrip(objects: list) -> float:
+    start = perf_counter()
+    codes = [IntPair.encode(obj) for obj in objects]
+    decoded = [IntPair.decode(code) for code in codes]
+    codes = [IntPair.encode(obj) for obj in decoded]
+    received = [IntPair.decode(code) for code in codes]
+    seconds = perf_counter() - start
+    assert received == objects
+    return seconds
+
+def main(n: int = 20_000):
+    objects = [IntPair(a=i * 7919 - 10**6, b=(i * i) % 100_003) for i in range(n)]
+    print(f"{n} objects, encoded and decoded twice")
+    print(f"  plain loop (no sockets):      {sync_roundtrip(objects):6.3f} s")
+    for batch_size in (16, 256):
+        seconds = asyncio.run(roundtrip(objects, batch_size=batch_size))
+        print(f"  threads, batch size {batch_size:>4}:     {seconds:6.3f} s")
+    # forked workers would inherit the sockets and keep the connections open
+    with ProcessPoolExecutor(mp_context=get_context("forkserver")) as executor:
+        seconds = asyncio.run(roundtrip(objects, batch_size=256, executor=executor))
+    print(f"  processes, batch size  256:   {seconds:6.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Memory saved by interning decoded objects.\n
+Run from the repository root: `python -m benchmarks.bench_interning`"""
+from enum import Enum
+from random import Random
+from time import perf_counter
+import tracemalloc
+
+from bij_type import BijType
+from btypes.numeric import Z
+from btypes.rational import Q
+from decorators import generate_bijection
+from interning import interning, interning_stats
+
+
+@generate_bijection
+class Unit(Enum):
+    METER = 0
+    SECOND = 1
+    KILOGRAM = 2
+
+@generate_bijection
+class Quantity(BijType):
+    unit: Unit
+    value: Q
+
+@generate_bijection
+class Measurement(BijType):
+    quantity: Quantity
+    offset: Z
+
+def dataset(n: int, distinct: int, seed: int = 0) -> list[int]:
+    """codes of n measurements drawn from `distinct` different ones"""
+    rng = Random(seed)
+    pool = Measurement.sample_codes(distinct, rng=rng, max_bits=12)
+    return [rng.choice(pool) for _ in range(n)]
+
+def measure(codes: list[int]) -> tuple[int, float]:
+    tracemalloc.start()
+    start = perf_counter()
+    objects = Measurement.decode_many(codes)
+    seconds = perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size, seconds
+
+def main(n: int = 50_000, distinct: int = 500):
+    codes = dataset(n, distinct)
+
+    plain_size, plain_seconds = measure(codes)
+    with interning():
+        interned_size, interned_seconds = measure(codes)
+        stats = interning_stats()
+
+    print(f"{n} decoded objects, {distinct} distinct codes")
+    print(f"plain:     {plain_size / 1e6:8.2f} MB  {plain_seconds:6.3f} s")
+    print(f"interned:  {interned_size / 1e6:8.2f} MB  {interned_seconds:6.3f} s")
+    print(f"saved:     {(plain_size - interned_size) / 1e6:8.2f} MB"
+          f"  ({stats.hits} hits, {stats.misses} misses)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Summing and multiplying many rationals: `Q` against `fractions.Fraction`.\n
+Run from the repository root: `python -m benchmarks.bench_rational`"""
+from fractions import Fraction
+from functools import reduce
+from math import prod
+from operator import add, mul
+from random import Random
+from time import perf_counter
+
+from btypes.rational import Q, q_prod, q_sum
+
+
+def timed(f, *args):
+    start = perf_counter()
+    result = f(*args)
+    return result, perf_counter() - start
+
+def bench_sum(title: str, fractions: list[Fraction]):
+    tuples = [(f.numerator, f.denominator) for f in fractions]
+    qs = [Q.from_tuple(t) for t in tuples]
+
+    print(title)
+    fraction_sum, t_fraction = timed(sum, fractions)
+    q_result, t_q = timed(Q.sum, qs)
+    tuple_result, t_tuple = timed(q_sum, tuples)
+    q_ops_result, t_q_ops = timed(reduce, add, qs)
+    assert (q_result.a, q_result.b) == tuple_result == (q_ops_result.a, q_ops_result.b) \
+        == (fraction_sum.numerator, fraction_sum.denominator)
+    print(f"  Fraction sum():       {t_fraction:7.3f} s")
+    print(f"  Q.sum:                {t_q:7.3f} s")
+    print(f"  q_sum on tuples:      {t_tuple:7.3f} s")
+    print(f"  Q + Q + ...:          {t_q_ops:7.3f} s")
+
+def bench_prod(title: str, small: list[Fraction]):
+    print(title)
+    fraction_prod, t_fraction = timed(prod, small)
+    q_result, t_q = timed(Q.prod, [Q.from_tuple((f.numerator, f.denominator)) for f in small])
+    q_ops_result, t_q_ops = timed(reduce, mul, [Q.from_tuple((f.numerator, f.denominator)) for f in small])
+    assert (q_result.a, q_result.b) == (q_ops_result.a, q_ops_result.b) \
+        == (fraction_prod.numerator, fraction_prod.denominator)
+    print(f"  Fraction prod():      {t_fraction:7.3f} s")
+    print(f"  Q.prod:               {t_q:7.3f} s")
+    print(f"  Q * Q * ...:          {t_q_ops:7.3f} s")
+
+def main(n: int = 200_000, seed: int = 0):
+    rng = Random(seed)
+    fractions = [Fraction(rng.randint(-1000, 1000), rng.randint(1, 1000)) for _ in range(n)]
+    # denominators dividing 1000 (e.g. amounts in thousandths) keep the sum small
+    bounded = [Fraction(rng.randint(-10**6, 10**6), rng.choice([1, 2, 4, 5, 8, 10, 100, 1000])) for _ in range(n)]
+
+    bench_sum(f"sum of {n} random rationals (denominators up to 1000)", fractions)
+    bench_sum(f"sum of {n} rationals with denominators dividing 1000", bounded)
+    # products of many random fractions explode; keep them few
+    bench_prod(f"product of {n // 100} random rationals", fractions[:n // 100])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Startup cost: import time and time to the first encode, each in a fresh interpreter.\n
+Run from the repository root: `python -m benchmarks.bench_startup`"""
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+from time import perf_counter
+start = perf_counter()
+import pydantic
+t_pydantic = perf_counter()
+from bij_type import BijType
+from decorators import generate_bijection
+from btypes.basic import union
+from btypes.numeric import IntPair, N1
+from btypes.rational import Q
+t_import = perf_counter()
+
+classes = [
+    generate_bijection(type(f"Model{i}", (BijType,), {"__annotations__": {"a": int, "b": bool, "c": IntPair}}))
+    for i in range({models})
+]
+Union = union(IntPair, N1, Q)
+t_classes = perf_counter()
+
+code = classes[0](a=3, b=True, c=IntPair(a=1, b=2)).encode()
+classes[0].decode(code)
+Union.decode(Union.encode(Q(a=1, b=2)))
+t_first = perf_counter()
+
+print(t_pydantic - start, t_import - t_pydantic, t_classes - t_import, t_first - t_classes)
+"""
+
+def run_probe(models: int) -> list[float]:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.replace("{models}", str(models))],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    return [float(x) for x in out.stdout.split()]
+
+def main(models: int = 30, runs: int = 5):
+    results = [run_probe(models) for _ in range(runs)]
+    best = [min(column) for column in zip(*results)]
+    labels = ["import pydantic", "import bijector modules", f"define {models} models + union", "first encode/decode"]
+    print(f"best of {runs} fresh interpreters")
+    for label, seconds in zip(labels, best):
+        print(f"{label:<32} {1000 * seconds:8.2f} ms")
+    print(f"{'total':<32} {1000 * sum(best):8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+from array import array
+from collections.abc import MutableSet
+from operator import and_, or_, xor
+from typing import Any, Callable, ClassVar, Iterable, Iterator, Self
+from sys import byteorder
+
+from bij_type import INFINITE_SIZE, BijType
+from btypes.basic import UnionType
+from decorators import assert_in_cls_range, bijectable_version
+
+BLOCK_SHIFT = 16
+BLOCK_BITS = 1 << BLOCK_SHIFT # codes per bitmap block
+DENSE_SIZE_LIMIT = 1 << 30    # largest class size for which `full()` and `~` build a dense bitmap
+
+
+def iter_set_bits(bits: int) -> Iterator[int]:
+    """yields the indices of the set bits of a non-negative integer in ascending order"""
+    if bits == 0:
+        return
+    word_num = (bits.bit_length() + 63) // 64
+    words = array("Q", bits.to_bytes(8 * word_num, "little"))
+    if byteorder == "big":
+        words.byteswap()
+    for word_index, word in enumerate(words):
+        base = 64 * word_index
+        while word:
+            low = word & -word
+            yield base + low.bit_length() - 1
+            word ^= low
+
+
+class BijSet(MutableSet):
+    """Set of objects of a finite bijectable class, stored as a bitmap over their codes.\n
+    Use as `BijSet[cls](objects)`.
+    The bitmap is split into blocks of `BLOCK_BITS` codes (bytearrays keyed by `code >> BLOCK_SHIFT`);
+    only blocks containing a member are allocated, so sparse sets of huge classes stay small.
+    Adding, removing and testing single objects is O(1);
+    set algebra between two BijSets of the same class works block by block on ints.
+    Objects are only decoded while iterating."""
+    _cls: ClassVar[type[BijType]] = ...
+    _item_types: ClassVar[tuple[type, ...]] = () # types whose instances can be members
+    _block_bytes: ClassVar[int] = 0
+    _typed: ClassVar[dict[type, type["BijSet"]]] = {}
+
+    def __class_getitem__(cls, item_cls: type) -> type[Self]:
+        if item_cls in cls._typed:
+            return cls._typed[item_cls]
+        bij_cls = bijectable_version(item_cls)
+        if bij_cls.size == INFINITE_SIZE:
+            raise TypeError(
+                f"BijSet requires a class of finite size!\n"
+                f"Class {item_cls.__name__!r} has infinite size.")
+        item_types = bij_cls._types if issubclass(bij_cls, UnionType) else (item_cls,)
+        newcls = type(f"BijSet[{item_cls.__name__}]", (cls,), {
+            "_cls": bij_cls,
+            "_item_types": item_types,
+            "_block_bytes": (min(bij_cls.size, BLOCK_BITS) + 7) // 8})
+        cls._typed[item_cls] = newcls
+        return newcls
+
+    def __init__(self, objects: Iterable = (), /):
+        if self.__class__._cls == ...:
+            raise TypeError("BijSet has to be parametrized with a class, e.g. `BijSet[cls]()`!")
+        self._blocks: dict[int, bytearray] = {}
+        self._counts: dict[int, int] = {} # members per block
+        self._len = 0
+        for obj in objects:
+            self.add(obj)
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[int]) -> Self:
+        newset = cls()
+        for code in codes:
+            assert_in_cls_range(cls._cls, code)
+            newset._add_code(code)
+        return newset
+
+    @classmethod
+    def from_bits(cls, bits: int) -> Self:
+        """set whose bitmap is `bits` (bit i set <=> object with code i is in the set)"""
+        if bits < 0 or bits.bit_length() > cls._cls.size:
+            raise ValueError(f"Bitmap exceeds the size {cls._cls.size} of class {cls._cls.__name__!r}!")
+        newset = cls()
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        for key, start in enumerate(range(0, len(data), BLOCK_BITS // 8)):
+            newset._set_block(key, int.from_bytes(data[start:start + BLOCK_BITS // 8], "little"))
+        return newset
+
+    @classmethod
+    def full(cls) -> Self:
+        newset = cls()
+        newset._fill(lambda bits, mask: mask)
+        return newset
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable) -> Self:
+        return cls(it)
+
+    @property
+    def bits(self) -> int:
+        """the whole bitmap as one int (as large as the largest member's code)"""
+        return sum(self._block_bits(key) << (key << BLOCK_SHIFT) for key in self._blocks)
+
+    def codes(self) -> Iterator[int]:
+        for key in sorted(self._blocks):
+            base = key << BLOCK_SHIFT
+            for offset in iter_set_bits(self._block_bits(key)):
+                yield base + offset
+
+    # -- blocks ----------------------
+    def _block_bits(self, key: int) -> int:
+        block = self._blocks.get(key)
+        return 0 if block is None else int.from_bytes(block, "little")
+
+    def _set_block(self, key: int, bits: int):
+        """replaces the block; empty blocks are dropped, so equal sets have equal blocks"""
+        count = bits.bit_count()
+        self._len += count - self._counts.get(key, 0)
+        if count:
+            self._blocks[key] = bytearray(bits.to_bytes(self._block_bytes, "little"))
+            self._counts[key] = count
+        else:
+            self._blocks.pop(key, None)
+            self._counts.pop(key, None)
+
+    def _combine(self, other: "BijSet", op: Callable[[int, int], int], keys: Iterable[int]) -> Self:
+        newset = self.__class__()
+        for key in keys:
+            newset._set_block(key, op(self._block_bits(key), other._block_bits(key)))
+        return newset
+
+    def _update(self, other: "BijSet", op: Callable[[int, int], int], keys: Iterable[int]) -> Self:
+        for key in list(keys):
+            self._set_block(key, op(self._block_bits(key), other._block_bits(key)))
+        return self
+
+    def _fill(self, op: Callable[[int, int], int]):
+        """applies `op(block bits, mask of all codes in the block)` to every block of the class"""
+        size = self._cls.size
+        if size > DENSE_SIZE_LIMIT:
+            raise ValueError(
+                f"Class {self._cls.__name__!r} of size {size} is too large for a dense bitmap!\n"
+                f"`full()` and `~` are limited to classes of size <= {DENSE_SIZE_LIMIT}.")
+        for key in range((size + BLOCK_BITS - 1) >> BLOCK_SHIFT):
+            mask = (1 << min(BLOCK_BITS, size - (key << BLOCK_SHIFT))) - 1
+            self._set_block(key, op(self._block_bits(key), mask))
+
+    def _is_subset(self, other: "BijSet") -> bool:
+        return self._len <= other._len and all(
+            self._block_bits(key) & ~other._block_bits(key) == 0
+            for key in self._blocks)
+
+    # -- single bits -----------------
+    def _code_of(self, obj: Any) -> int | None:
+        """code of `obj`, or None if `obj` can't be an element of this set"""
+        if not isinstance(obj, self._item_types):
+            return None
+        try:
+            code = self._cls.encode(obj)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+        return code if 0 <= code < self._cls.size else None
+
+    def _has_code(self, code: int) -> bool:
+        block = self._blocks.get(code >> BLOCK_SHIFT)
+        offset = code & (BLOCK_BITS - 1)
+        return block is not None and bool(block[offset >> 3] >> (offset & 7) & 1)
+
+    def _add_code(self, code: int):
+        key = code >> BLOCK_SHIFT
+        offset = code & (BLOCK_BITS - 1)
+        block = self._blocks.get(key)
+        if block is None:
+            block = self._blocks[key] = bytearray(self._block_bytes)
+            self._counts[key] = 0
+        mask = 1 << (offset & 7)
+        if not block[offset >> 3] & mask:
+            block[offset >> 3] |= mask
+            self._counts[key] += 1
+            self._len += 1
+
+    def _discard_code(self, code: int):
+        key = code >> BLOCK_SHIFT
+        offset = code & (BLOCK_BITS - 1)
+        block = self._blocks.get(key)
+        mask = 1 << (offset & 7)
+        if block is None or not block[offset >> 3] & mask:
+            return
+        block[offset >> 3] ^= mask
+        self._len -= 1
+        self._counts[key] -= 1
+        if not self._counts[key]:
+            del self._blocks[key]
+            del self._counts[key]
+
+    # -- MutableSet interface --------
+    def __contains__(self, obj: Any) -> bool:
+        code = self._code_of(obj)
+        return code is not None and self._has_code(code)
+
+    def __iter__(self) -> Iterator:
+        for code in self.codes():
+            yield self._cls.decode(code)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, obj: Any):
+        code = self._code_of(obj)
+        if code is None:
+            item_names = " | ".join(item_type.__name__ for item_type in self._item_types)
+            raise TypeError(f"{obj!r} can't be an element of a {self.__class__.__name__} (expected {item_names})!")
+        self._add_code(code)
+
+    def discard(self, obj: Any):
+        code = self._code_of(obj)
+        if code is not None:
+            self._discard_code(code)
+
+    def copy(self) -> Self:
+        newset = self.__class__()
+        newset._blocks = {key: bytearray(block) for key, block in self._blocks.items()}
+        newset._counts = dict(self._counts)
+        newset._len = self._len
+        return newset
+
+    def clear(self):
+        self._blocks.clear()
+        self._counts.clear()
+        self._len = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    # -- bitmap algebra --------------
+    def _same_type(self, other: Any) -> bool:
+        return isinstance(other, BijSet) and other._cls is self._cls
+
+    def __eq__(self, other: Any) -> bool:
+        if self._same_type(other):
+            return self._len == other._len and self._blocks == other._blocks
+        return super().__eq__(other)
+
+    def __le__(self, other: Any) -> bool:
+        if self._same_type(other):
+            return self._is_subset(other)
+        return super().__le__(other)
+
+    def __ge__(self, other: Any) -> bool:
+        if self._same_type(other):
+            return other._is_subset(self)
+        return super().__ge__(other)
+
+    def __lt__(self, other: Any) -> bool:
+        return self <= other and self != other
+
+    def __gt__(self, other: Any) -> bool:
+        return self >= other and self != other
+
+    def isdisjoint(self, other: Iterable) -> bool:
+        if self._same_type(other):
+            return not any(
+                self._block_bits(key) & other._block_bits(key)
+                for key in self._blocks.keys() & other._blocks.keys())
+        return super().isdisjoint(other)
+
+    def __or__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._combine(other, or_, self._blocks.keys() | other._blocks.keys())
+        return super().__or__(other)
+
+    def __and__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._combine(other, and_, self._blocks.keys() & other._blocks.keys())
+        return super().__and__(other)
+
+    def __sub__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._combine(other, lambda a, b: a & ~b, self._blocks.keys())
+        return super().__sub__(other)
+
+    def __xor__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._combine(other, xor, self._blocks.keys() | other._blocks.keys())
+        return super().__xor__(other)
+
+    def __invert__(self) -> Self:
+        """complement with respect to all objects of the class
+        (dense, so only for classes of size <= `DENSE_SIZE_LIMIT`)"""
+        newset = self.copy()
+        newset._fill(xor)
+        return newset
+
+    def __ior__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._update(other, or_, other._blocks.keys())
+        return super().__ior__(other)
+
+    def __iand__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._update(other, and_, self._blocks.keys())
+        return super().__iand__(other)
+
+    def __isub__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._update(other, lambda a, b: a & ~b, self._blocks.keys() & other._blocks.keys())
+        return super().__isub__(other)
+
+    def __ixor__(self, other: Iterable) -> Self:
+        if self._same_type(other):
+            return self._update(other, xor, other._blocks.keys())
+        return super().__ixor__(other)
+
+    __hash__ = None
@@ -1,5 +1,6 @@
 
-from typing import ClassVar, Self
+from random import Random
+from typing import ClassVar, Iterable, Self
 from pydantic import BaseModel
 
 INFINITE_SIZE = -1
@@ -28,6 +29,35 @@ class BijType(BaseModel):
     def validate(self) -> bool:
         ...
 
+    @classmethod
+    def decode_many(cls, codes: Iterable[int]) -> list[Self]:
+        """decodes a batch of codes"""
+        return [cls.decode(code) for code in codes]
+
+    @classmethod
+    def sample_codes(cls, n: int, *, rng: Random | int | None = None, max_bits: int | None = None) -> list[int]:
+        """draws n codes uniformly at random (with replacement).\n
+        For finite classes codes are drawn from [0, size) (max_bits caps the range if given),
+        for infinite classes from [0, 2**max_bits).\n
+        `rng` is a `random.Random` or a seed for reproducible samples."""
+        if cls.size == ...:
+            raise AttributeError(
+                f"Class {cls.__name__!r} does not define class attribute 'size: int'!")
+        if cls.size == INFINITE_SIZE and max_bits is None:
+            raise ValueError(
+                f"Sampling from class {cls.__name__!r} of infinite size requires 'max_bits'!")
+
+        bound = cls.size if max_bits is None else 1 << max_bits
+        if cls.size != INFINITE_SIZE:
+            bound = min(bound, cls.size)
+        rng = rng if isinstance(rng, Random) else Random(rng)
+        return [rng.randrange(bound) for _ in range(n)]
+
+    @classmethod
+    def sample(cls, n: int, *, rng: Random | int | None = None, max_bits: int | None = None) -> list[Self]:
+        """n objects drawn uniformly at random by code, see `sample_codes`"""
+        return cls.decode_many(cls.sample_codes(n, rng=rng, max_bits=max_bits))
+
 class BijAdapter(BijType):
     """Class for adapters that make primitive data types encodable"""
     __cls: ClassVar[type]
@@ -32,6 +32,9 @@ def assert_isinstance_exact(cls: UnionType, instance):
     raise TypeError(f"Instance for `union(...).encode` has to "
                     f"be instance of any of {cls._types} (not subclass)!")
 
+# built union classes by their (sorted) types, so that equal unions are built only once
+UNION_CACHE: dict[tuple[type], type[UnionType]] = {}
+
 def union(*types: BijType) -> type[BijType]:
     """Union of types: Encode any object of the given types.\n
     Two Union types are the same if the set of their types is the same.\n
@@ -39,6 +42,8 @@ def union(*types: BijType) -> type[BijType]:
     # the union is the same if reordered or a type appears multiple times
     types = sorted(set(types), key=lambda cls: cls.__name__)
     types = tuple(types)
+    if types in UNION_CACHE:
+        return UNION_CACHE[types]
 
     bij_version = {cls: bijectable_version(cls) for cls in types}
 
@@ -103,5 +108,6 @@ def union(*types: BijType) -> type[BijType]:
     newcls.size = INFINITE_SIZE if inf_types else fin_sum
     newcls.encode = encode
     newcls.decode = classmethod(decode)
+    UNION_CACHE[types] = newcls
     return newcls
 
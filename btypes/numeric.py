@@ -1,8 +1,15 @@
 
-from typing import ClassVar
+from typing import ClassVar, Iterable, Iterator
 from bij_type import INFINITE_SIZE, BijType
 from decorators import derive, generate_bijection
-from pairing_bijections import i_to_ii, i_to_ilist, ii_to_i, ilist_to_i
+from pairing_bijections import (
+    i_to_ii,
+    i_to_ilist,
+    i_to_ilist_reversed,
+    ii_to_i,
+    ilist_to_i,
+    ilist_to_i_counted
+    )
 
 
 class N0(BijType):
@@ -42,10 +49,24 @@ class IntList(BijType):
     def decode(cls, code: int):
         length, rest = i_to_ii(code)
         lis = i_to_ilist(rest, length=length)
-        return cls(lis)
+        return cls(elements=lis)
     
     def encode(self):
         length = len(self.elements)
         el_code = ilist_to_i(self.elements)
         # TODO: give more priority to el_code
+        return ii_to_i(length, el_code)
+
+    @staticmethod
+    def iter_decode_reversed(code: int) -> Iterator[int]:
+        """yields the elements of `decode(code).elements` from the last to the first,
+        without building the list"""
+        length, rest = i_to_ii(code)
+        return i_to_ilist_reversed(rest, length=length)
+
+    @staticmethod
+    def encode_iter(elements: Iterable[int]) -> int:
+        """same code as `IntList(elements=list(elements)).encode()`,
+        but consumes the elements one by one"""
+        el_code, length = ilist_to_i_counted(elements)
         return ii_to_i(length, el_code)
\ No newline at end of file
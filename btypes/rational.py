@@ -1,8 +1,9 @@
 
 from math import gcd
-from typing import ClassVar, Iterator, Self
+from typing import ClassVar, Iterable, Iterator, Self
 
 from decorators import INFINITE_SIZE, BijType
+from interning import interned
 from pairing_bijections import fi_to_i, i_to_fi
 
 Q = tuple[int, int]
@@ -48,6 +49,55 @@ def num_to_q(z: int) -> Q:
         current = child(*current, int(bit))
     return current
 
+# == Arithmetic on reduced tuples ==
+# All (a, b) below are reduced with b > 0; results are again reduced with b > 0.
+# The gcds are taken of the smallest possible numbers (Henrici), as in `fractions.Fraction`.
+def normalized(a: int, b: int) -> Q:
+    if b < 0:
+        a, b = -a, -b
+    g = gcd(a, b)
+    return (a//g, b//g) if a else (0, 1)
+
+def q_add(a: int, b: int, c: int, d: int) -> Q:
+    g = gcd(b, d)
+    if g == 1:
+        return (a*d + b*c, b*d)
+    s = b // g
+    t = a * (d // g) + c * s
+    if t == 0:
+        return (0, 1)
+    g2 = gcd(t, g)
+    return (t // g2, s * (d // g2))
+
+def q_mul(a: int, b: int, c: int, d: int) -> Q:
+    if a == 0 or c == 0:
+        return (0, 1)
+    g1 = gcd(a, d)
+    g2 = gcd(c, b)
+    return ((a // g1) * (c // g2), (b // g2) * (d // g1))
+
+def q_div(a: int, b: int, c: int, d: int) -> Q:
+    if c == 0:
+        raise ZeroDivisionError(f"division of {a}/{b} by zero!")
+    return q_mul(a, b, d, c) if c > 0 else q_mul(a, b, -d, -c)
+
+def q_divmod(a: int, b: int, c: int, d: int) -> tuple[int, Q]:
+    """returns (floor(a/b / c/d), a/b - floor(...) * c/d)"""
+    num, rest = divmod(a * d, c * b)
+    return num, normalized(rest, b * d)
+
+def q_sum(qs: Iterable[Q]) -> Q:
+    acc = (0, 1)
+    for c, d in qs:
+        acc = q_add(*acc, c, d)
+    return acc
+
+def q_prod(qs: Iterable[Q]) -> Q:
+    acc = (1, 1)
+    for c, d in qs:
+        acc = q_mul(*acc, c, d)
+    return acc
+
 class Q(BijType):
     size: ClassVar[int] = INFINITE_SIZE
     a: int
@@ -102,6 +152,7 @@ class Q(BijType):
         return 3 + fi_to_i(mode, num, m=4)
     
     @classmethod
+    @interned
     def decode(cls, c: int):
         match c:
             case 0: return cls(a=0,b=1)
@@ -124,33 +175,86 @@ class Q(BijType):
         g = gcd(a, b)
         return cls(a=a//g, b=b//g)
 
+    @classmethod
+    def from_tuple(cls, q: tuple[int, int]) -> Self:
+        """from an already reduced tuple (a, b) with b > 0"""
+        return cls(a=q[0], b=q[1])
+
+    def as_tuple(self) -> tuple[int, int]:
+        """reduced (a, b) with b > 0"""
+        return (self.a, self.b) if self.b > 0 else (-self.a, -self.b)
+
+    @staticmethod
+    def _tuple_of(value: Self | int) -> tuple[int, int]:
+        return (value, 1) if isinstance(value, int) else value.as_tuple()
+
+    @classmethod
+    def sum(cls, values: Iterable[Self | int]) -> Self:
+        """sum of many values; the accumulation runs on tuples, only the result is a `Q`"""
+        return cls.from_tuple(q_sum(map(cls._tuple_of, values)))
+
+    @classmethod
+    def prod(cls, values: Iterable[Self | int]) -> Self:
+        """product of many values; the accumulation runs on tuples, only the result is a `Q`"""
+        return cls.from_tuple(q_prod(map(cls._tuple_of, values)))
+
     def __neg__(self) -> Self:
-        return Q(-self.a, self.b)
+        return Q(a=-self.a, b=self.b)
 
-    def __add__(self, other: Self) -> Self:
-        divisor = self.b * other.b
-        return Q.reduced(self.a * other.b + other.a * self.b, divisor)
+    def __add__(self, other: Self | int) -> Self:
+        return Q.from_tuple(q_add(*self.as_tuple(), *Q._tuple_of(other)))
         
-    def __sub__(self, other: Self) -> Self:
-        return self + (- other)
+    def __sub__(self, other: Self | int) -> Self:
+        c, d = Q._tuple_of(other)
+        return Q.from_tuple(q_add(*self.as_tuple(), -c, d))
     
-    def __mul__(self, other: Self) -> Self:
-        return Q.reduced(self.a * other.a, self.b * other.b)
+    def __mul__(self, other: Self | int) -> Self:
+        return Q.from_tuple(q_mul(*self.as_tuple(), *Q._tuple_of(other)))
 
-    def __div__(self, other: Self) -> Self:
-        return Q.reduced(self.a * other.b, self.b * other.a)
+    def __truediv__(self, other: Self | int) -> Self:
+        return Q.from_tuple(q_div(*self.as_tuple(), *Q._tuple_of(other)))
     
     def __mod__(self, other: Self | int) -> Self:
-        o = Q(a=other, b=1) if isinstance(other, int) else other
-        divisor = self.b * o.b
-        rest = (self.a * o.b) % (o.a * self.b)
-        return Q.reduced(rest, divisor)
+        _, rest = q_divmod(*self.as_tuple(), *Q._tuple_of(other))
+        return Q.from_tuple(rest)
     
     def __divmod__(self, other: Self | int) -> tuple[Self, Self]:
-        o = Q(a=other, b=1) if isinstance(other, int) else other
-        divisor = self.b * o.b
-        num, rest = divmod(self.a * o.b, o.a * self.b)
-        return Q.from_int(num), Q.reduced(rest, divisor)
+        num, rest = q_divmod(*self.as_tuple(), *Q._tuple_of(other))
+        return Q.from_int(num), Q.from_tuple(rest)
+
+    # reflected: `int op Q` (and `sum(qs)`, which starts at 0)
+    def __radd__(self, other: int) -> Self:
+        if not isinstance(other, int):
+            return NotImplemented
+        return Q.from_tuple(q_add(other, 1, *self.as_tuple()))
+
+    def __rsub__(self, other: int) -> Self:
+        if not isinstance(other, int):
+            return NotImplemented
+        a, b = self.as_tuple()
+        return Q.from_tuple(q_add(other, 1, -a, b))
+
+    def __rmul__(self, other: int) -> Self:
+        if not isinstance(other, int):
+            return NotImplemented
+        return Q.from_tuple(q_mul(other, 1, *self.as_tuple()))
+
+    def __rtruediv__(self, other: int) -> Self:
+        if not isinstance(other, int):
+            return NotImplemented
+        return Q.from_tuple(q_div(other, 1, *self.as_tuple()))
+
+    def __rmod__(self, other: int) -> Self:
+        if not isinstance(other, int):
+            return NotImplemented
+        _, rest = q_divmod(other, 1, *self.as_tuple())
+        return Q.from_tuple(rest)
+
+    def __rdivmod__(self, other: int) -> tuple[Self, Self]:
+        if not isinstance(other, int):
+            return NotImplemented
+        num, rest = q_divmod(other, 1, *self.as_tuple())
+        return Q.from_int(num), Q.from_tuple(rest)
 
     def __eq__(self, value):
         if isinstance(value, Q):
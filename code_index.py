@@ -0,0 +1,233 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import islice
+from typing import Any, ClassVar, Iterable, Iterator, Self
+
+from bij_type import BijType
+from decorators import bijectable_version
+
+WORD_LIMIT = 1 << 64
+CHUNK_SIZE = 1024
+
+
+def chunked(codes: list[int], size: int) -> list[array]:
+    """splits sorted codes into arrays of (at most) `size` codes"""
+    return [array("Q", codes[i:i+size]) for i in range(0, len(codes), size)]
+
+def merge_unique(*sorted_codes: Iterable[int]) -> Iterator[int]:
+    """merges sorted iterables, dropping duplicates"""
+    last = None
+    for code in merge(*sorted_codes):
+        if code != last:
+            yield code
+            last = code
+
+
+class CodeIndex:
+    """Sorted index of objects of a bijectable class, keyed by their codes.\n
+    Use as `CodeIndex[cls](objects)`.
+    Codes below 2**64 are stored in sorted chunks of 8-byte words,
+    larger codes in a sorted overflow list of Python ints.
+    Objects are only decoded when they are retrieved."""
+    _cls: ClassVar[type[BijType]] = ...
+    _typed: ClassVar[dict[type, type["CodeIndex"]]] = {}
+
+    def __class_getitem__(cls, item_cls: type) -> type[Self]:
+        if item_cls in cls._typed:
+            return cls._typed[item_cls]
+        bij_cls = bijectable_version(item_cls)
+        newcls = type(f"CodeIndex[{item_cls.__name__}]", (cls,), {"_cls": bij_cls})
+        cls._typed[item_cls] = newcls
+        return newcls
+
+    def __init__(self, objects: Iterable = (), /):
+        if self.__class__._cls == ...:
+            raise TypeError("CodeIndex has to be parametrized with a class, e.g. `CodeIndex[cls]()`!")
+        self._chunks: list[array] = []
+        self._maxes: list[int] = [] # last (largest) code of each chunk
+        self._overflow: list[int] = []
+        self._len = 0
+        self.update(objects)
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[int]) -> Self:
+        index = cls()
+        index.update_codes(codes)
+        return index
+
+    # -- insertion -------------------
+    def add(self, obj: Any) -> int:
+        """inserts the object and returns its code"""
+        code = self._cls.encode(obj)
+        self.add_code(code)
+        return code
+
+    def add_code(self, code: int) -> bool:
+        """returns whether the code was newly inserted"""
+        if code < 0:
+            raise ValueError(f"Codes are non-negative, got {code}!")
+        if code >= WORD_LIMIT:
+            return self._add_overflow(code)
+
+        if not self._chunks:
+            self._chunks.append(array("Q", [code]))
+            self._maxes.append(code)
+            self._len += 1
+            return True
+
+        chunk_index = min(bisect_left(self._maxes, code), len(self._chunks) - 1)
+        chunk = self._chunks[chunk_index]
+        pos = bisect_left(chunk, code)
+        if pos < len(chunk) and chunk[pos] == code:
+            return False
+        chunk.insert(pos, code)
+        self._maxes[chunk_index] = chunk[-1]
+        self._len += 1
+
+        if len(chunk) > 2 * CHUNK_SIZE:
+            self._chunks[chunk_index:chunk_index+1] = [chunk[:CHUNK_SIZE], chunk[CHUNK_SIZE:]]
+            self._maxes[chunk_index:chunk_index+1] = [chunk[CHUNK_SIZE-1], chunk[-1]]
+        return True
+
+    def _add_overflow(self, code: int) -> bool:
+        pos = bisect_left(self._overflow, code)
+        if pos < len(self._overflow) and self._overflow[pos] == code:
+            return False
+        self._overflow.insert(pos, code)
+        self._len += 1
+        return True
+
+    def update(self, objects: Iterable):
+        """bulk insertion of objects"""
+        self.update_codes(self._cls.encode(obj) for obj in objects)
+
+    def update_codes(self, codes: Iterable[int]):
+        """bulk insertion: sorts only the new codes and merges them chunk by chunk.
+        Chunks that receive no new code are kept as they are."""
+        small = array("Q")
+        big = []
+        for code in codes:
+            if code < 0:
+                raise ValueError(f"Codes are non-negative, got {code}!")
+            if code >= WORD_LIMIT:
+                big.append(code)
+            else:
+                small.append(code)
+
+        if small:
+            new = sorted(set(small))
+            chunks = []
+            pos = 0
+            for chunk in self._chunks:
+                end = bisect_right(new, chunk[-1], pos) # new codes that belong into this chunk
+                if end == pos:
+                    chunks.append(chunk)
+                    continue
+                merged = sorted(set(chunk).union(new[pos:end]))
+                chunks.extend(chunked(merged, CHUNK_SIZE) if len(merged) > 2 * CHUNK_SIZE else [array("Q", merged)])
+                pos = end
+            chunks.extend(chunked(new[pos:], CHUNK_SIZE))
+            self._chunks = chunks
+            self._maxes = [chunk[-1] for chunk in chunks]
+
+        if big:
+            self._overflow = list(merge_unique(self._overflow, sorted(big)))
+        self._len = sum(len(chunk) for chunk in self._chunks) + len(self._overflow)
+
+    # -- removal ---------------------
+    def discard(self, obj: Any):
+        self.discard_code(self._cls.encode(obj))
+
+    def discard_code(self, code: int):
+        if code >= WORD_LIMIT:
+            pos = bisect_left(self._overflow, code)
+            if pos < len(self._overflow) and self._overflow[pos] == code:
+                del self._overflow[pos]
+                self._len -= 1
+            return
+
+        chunk_index = bisect_left(self._maxes, code)
+        if chunk_index == len(self._chunks):
+            return
+        chunk = self._chunks[chunk_index]
+        pos = bisect_left(chunk, code)
+        if chunk[pos] != code:
+            return
+        del chunk[pos]
+        self._len -= 1
+        if chunk:
+            self._maxes[chunk_index] = chunk[-1]
+        else:
+            del self._chunks[chunk_index]
+            del self._maxes[chunk_index]
+
+    # -- lookup ----------------------
+    def contains_code(self, code: int) -> bool:
+        if code >= WORD_LIMIT:
+            pos = bisect_left(self._overflow, code)
+            return pos < len(self._overflow) and self._overflow[pos] == code
+        chunk_index = bisect_left(self._maxes, code)
+        if chunk_index == len(self._chunks):
+            return False
+        chunk = self._chunks[chunk_index]
+        return chunk[bisect_left(chunk, code)] == code
+
+    def __contains__(self, obj: Any) -> bool:
+        return self.contains_code(self._cls.encode(obj))
+
+    def __getitem__(self, code: int) -> Any:
+        """the object with the given code (if it is in the index)"""
+        if not self.contains_code(code):
+            raise KeyError(code)
+        return self._cls.decode(code)
+
+    def __len__(self) -> int:
+        return self._len
+
+    # -- scans -----------------------
+    def range_codes(self, start: int = 0, stop: int | None = None) -> Iterator[int]:
+        """codes in [start, stop) in ascending order"""
+        if start < WORD_LIMIT:
+            small_stop = WORD_LIMIT if stop is None else min(stop, WORD_LIMIT)
+            chunk_index = bisect_left(self._maxes, start)
+            pos = bisect_left(self._chunks[chunk_index], start) if chunk_index < len(self._chunks) else 0
+            for chunk in islice(self._chunks, chunk_index, None):
+                end = bisect_left(chunk, small_stop)
+                yield from chunk[pos:end]
+                if end < len(chunk):
+                    return
+                pos = 0
+
+        lo = bisect_left(self._overflow, start)
+        hi = len(self._overflow) if stop is None else bisect_left(self._overflow, stop)
+        yield from islice(self._overflow, lo, hi)
+
+    def range(self, start: int = 0, stop: int | None = None) -> Iterator:
+        """objects with codes in [start, stop), decoded lazily in ascending code order"""
+        for code in self.range_codes(start, stop):
+            yield self._cls.decode(code)
+
+    def codes(self) -> Iterator[int]:
+        return self.range_codes()
+
+    def __iter__(self) -> Iterator:
+        return self.range()
+
+    def count_range(self, start: int = 0, stop: int | None = None) -> int:
+        """number of codes in [start, stop) without iterating over them"""
+        stop_rank = self._len if stop is None else self._rank(stop)
+        return max(0, stop_rank - self._rank(start))
+
+    def _rank(self, code: int) -> int:
+        """number of stored codes < code"""
+        if code >= WORD_LIMIT:
+            return self._len - len(self._overflow) + bisect_left(self._overflow, code)
+        chunk_index = bisect_left(self._maxes, code)
+        before = sum(len(chunk) for chunk in islice(self._chunks, chunk_index))
+        if chunk_index == len(self._chunks):
+            return before
+        return before + bisect_left(self._chunks[chunk_index], code)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{self._len} codes>)"
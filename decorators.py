@@ -1,20 +1,22 @@
 
 from enum import Enum
 from math import prod
-from typing import Callable, ClassVar, Self
-import inspect
+from typing import Callable, ClassVar, Iterator, Self
 
 from pydantic import BaseModel
 
 from bij_type import BijAdapter, BijType, INFINITE_SIZE
-from helpers import classcopy
+from helpers import classcopy, scan
+from interning import decode_interned, interned
 from pairing_bijections import (
+    count_fixed_digits,
     f_to_flist,
     fi_to_i,
     i_to_fi,
     flist_to_f,
     ilist_to_i,
-    i_to_ilist
+    i_to_ilist,
+    next_fixed_digits
     )
 
 # ================================
@@ -119,10 +121,16 @@ def _process_derive[CT, AuxT](
 
     bij_aux_cls = bijectable_version(aux_cls)
     
-    def decode(code: int) -> Self:
+    def decode_uninterned(code: int) -> Self:
         assert_in_cls_range(newcls, code)
         aux_obj = bij_aux_cls.decode(code)
         return from_aux(aux_obj)
+
+    def decode(code: int) -> Self:
+        # only derived models are interned; adapters return primitives (e.g. int)
+        if not as_decorator:
+            return decode_uninterned(code)
+        return decode_interned(newcls, code, decode_uninterned)
     
     def encode(self):
         aux_obj = to_aux(self)
@@ -177,6 +185,10 @@ def _process_gb_enum(cls: type[Enum]) -> type:
     cls.size = value_num
     cls.decode = classmethod(decode)
     cls.encode = encode
+    # Enums can't inherit from BijType, so the batch helpers are attached directly
+    cls.decode_many = classmethod(BijType.decode_many.__func__)
+    cls.sample_codes = classmethod(BijType.sample_codes.__func__)
+    cls.sample = classmethod(BijType.sample.__func__)
 
     return cls
 
@@ -229,6 +241,7 @@ def _process_gb_pydantic(cls, exclude: list[str]) -> type[BijType]:
     finnum = len(fin_attrs)
     infnum = len(inf_attrs)
  
+    @interned
     def decode(cls, code: int):
         """does not allow for excluded attributes yet!"""
         assert_in_cls_range(cls, code)
@@ -258,9 +271,109 @@ def _process_gb_pydantic(cls, exclude: list[str]) -> type[BijType]:
         inf_code = ilist_to_i(inf_attr_codes)
         return fi_to_i(fin_code, inf_code, m=finmax)
 
+    fin_attr_indices = {name: i for i, (name, _) in enumerate(fin_attrs)}
+    inf_attr_indices = {name: i for i, (name, _) in enumerate(inf_attrs)}
+    # place value of each finite attribute in the mixed-radix finite part (and thus in the code)
+    fin_mults = list(scan(lambda a, b: a*b, fin_maxes, acc=1, yield_start=True))
+
+    def fixed_digits(field_values: dict) -> dict[int, int]:
+        """maps the queried field values to (finite attribute index -> code)"""
+        fixed = {}
+        for attr_name, value in field_values.items():
+            if attr_name in inf_attr_indices:
+                raise ValueError(
+                    f"Can only query finite attributes of class {cls.__name__!r}!\n"
+                    f"Attribute {attr_name!r} has infinite size.")
+            if attr_name not in fin_attr_indices:
+                raise ValueError(
+                    f"Class {cls.__name__!r} has no bijectable attribute {attr_name!r}!")
+            index = fin_attr_indices[attr_name]
+            attr_type = fin_attrs[index][1]
+            try:
+                attr_code = attr_type.encode(value)
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise ValueError(
+                    f"Value {value!r} can't be encoded as attribute {attr_name!r} of class {cls.__name__!r}!\n"
+                    f"{e.__class__.__name__}: {e}") from e
+            if not 0 <= attr_code < attr_type.size:
+                raise ValueError(
+                    f"Value {value!r} is out of range for attribute {attr_name!r} of class {cls.__name__!r}!")
+            fixed[index] = attr_code
+        return fixed
+
+    def query_stop(cls, stop: int | None) -> int | None:
+        if cls.size == INFINITE_SIZE:
+            return stop
+        return cls.size if stop is None else min(stop, cls.size)
+
+    def count_where(cls, start: int = 0, stop: int | None = None, /, **field_values) -> int:
+        """number of codes in [start, stop) whose objects have the given (finite) attribute values.\n
+        Computed from the mixed-radix layout of the finite part; no object is decoded."""
+        start = max(start, 0) # there are no negative codes
+        stop = query_stop(cls, stop)
+        if stop is None:
+            raise ValueError(f"Counting over class {cls.__name__!r} of infinite size requires a stop code!")
+        if stop <= start:
+            return 0
+        fixed = fixed_digits(field_values)
+        return (count_fixed_digits(stop, maxes=fin_maxes, fixed=fixed)
+                - count_fixed_digits(start, maxes=fin_maxes, fixed=fixed))
+
+    def codes_where(cls, start: int = 0, stop: int | None = None, /, **field_values) -> Iterator[int]:
+        """codes in [start, stop) whose objects have the given (finite) attribute values, in ascending order.\n
+        Jumps from one matching code to the next, so the cost is proportional to the number of hits.\n
+        If `stop` is None and the class is infinite, the iterator does not terminate."""
+        start = max(start, 0) # there are no negative codes
+        stop = query_stop(cls, stop)
+        fixed = fixed_digits(field_values)
+        code = next_fixed_digits(start, maxes=fin_maxes, fixed=fixed)
+        while stop is None or code < stop:
+            yield code
+            code = next_fixed_digits(code + 1, maxes=fin_maxes, fixed=fixed)
+
+    def where(cls, start: int = 0, stop: int | None = None, /, **field_values) -> Iterator[Self]:
+        """objects with codes in [start, stop) that have the given (finite) attribute values"""
+        for code in codes_where(cls, start, stop, **field_values):
+            yield cls.decode(code)
+
+    def reencode(cls, code: int, /, *, field: str, new, old = ...) -> int:
+        """code of the object with code `code` after setting attribute `field` to `new`.\n
+        Finite attributes: a single multiply-add on the code
+        (the old value is read from the code if not given).
+        Infinite attributes: only the infinite part is unpacked to attribute codes and repacked;
+        no attribute is decoded."""
+        assert_in_cls_range(cls, code)
+        if field in fin_attr_indices:
+            index = fin_attr_indices[field]
+            attr_type = fin_attrs[index][1]
+            mult = fin_mults[index]
+            old_attr_code = (code // mult) % attr_type.size if old is ... else attr_type.encode(old)
+            return code + (attr_type.encode(new) - old_attr_code) * mult
+        if field in inf_attr_indices:
+            index = inf_attr_indices[field]
+            attr_type = inf_attrs[index][1]
+            fin_code, inf_code = i_to_fi(code, m=finmax)
+            inf_attr_codes = i_to_ilist(inf_code, length=infnum)
+            inf_attr_codes[index] = attr_type.encode(new)
+            return fi_to_i(fin_code, ilist_to_i(inf_attr_codes), m=finmax)
+        raise ValueError(f"Class {cls.__name__!r} has no bijectable attribute {field!r}!")
+
+    def updated_code(self: BijType, code: int | None = None, /, **changes) -> int:
+        """code of this object with the given attributes changed, computed from its code
+        (`code` if given, else `self.encode()`) by `reencode`; the object itself is not changed"""
+        code = self.encode() if code is None else code
+        for attr_name, new in changes.items():
+            code = reencode(self.__class__, code, field=attr_name, new=new, old=self.__getattribute__(attr_name))
+        return code
+
     cls.size = INFINITE_SIZE if inf_attrs else finmax
     cls.decode = classmethod(decode)
     cls.encode = encode
+    cls.reencode = classmethod(reencode)
+    cls.updated_code = updated_code
+    cls.count_where = classmethod(count_where)
+    cls.codes_where = classmethod(codes_where)
+    cls.where = classmethod(where)
     
     return cls
 
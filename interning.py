@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator
+from weakref import WeakValueDictionary, finalize
+
+from pydantic import BaseModel
+
+
+class InternStats(BaseModel):
+    hits: int = 0   # decodes answered by a shared instance
+    misses: int = 0 # decodes that created a new instance
+    live: int = 0   # instances currently held by the pool
+
+
+_pool: WeakValueDictionary[tuple[type, int], Any] = WeakValueDictionary()
+_enabled = False
+_hits = 0
+_misses = 0
+_frozen: set[int] = set()   # ids of instances handed out by the pool
+_guarded: set[type] = set() # classes whose __setattr__/__delattr__ check `_frozen`
+
+def enable_interning():
+    """decoded objects of generated/derived classes are shared per (class, code) from now on.\n
+    Shared instances are read-only (also after interning is disabled again);
+    use `obj.model_copy(update=...)` to get a modified copy."""
+    global _enabled
+    _enabled = True
+
+def disable_interning(clear: bool = True):
+    global _enabled
+    _enabled = False
+    if clear:
+        clear_interning()
+
+def clear_interning():
+    global _hits, _misses
+    _pool.clear()
+    _hits = 0
+    _misses = 0
+
+def is_interning() -> bool:
+    return _enabled
+
+@contextmanager
+def interning(clear: bool = True) -> Iterator[None]:
+    """enables interning inside the `with` block"""
+    was_enabled = _enabled
+    enable_interning()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable_interning(clear=clear)
+
+def interning_stats() -> InternStats:
+    return InternStats(hits=_hits, misses=_misses, live=len(_pool))
+
+def is_frozen(obj: Any) -> bool:
+    """whether `obj` is a shared instance of the pool (and therefore read-only)"""
+    return id(obj) in _frozen
+
+def _guard(cls: type):
+    """makes the instances of `cls` that are in `_frozen` reject attribute assignment and deletion"""
+    setattr_unguarded = cls.__setattr__
+    delattr_unguarded = cls.__delattr__
+
+    def __setattr__(self, name: str, value: Any):
+        if id(self) in _frozen:
+            raise TypeError(
+                f"Instance of {cls.__name__!r} is shared by interning and can't be modified!\n"
+                f"Use `obj.model_copy(update={{{name!r}: ...}})` instead.")
+        setattr_unguarded(self, name, value)
+
+    def __delattr__(self, name: str):
+        if id(self) in _frozen:
+            raise TypeError(f"Instance of {cls.__name__!r} is shared by interning and can't be modified!")
+        delattr_unguarded(self, name)
+
+    cls.__setattr__ = __setattr__
+    cls.__delattr__ = __delattr__
+    _guarded.add(cls)
+
+def _freeze(obj: Any):
+    cls = type(obj)
+    if cls not in _guarded:
+        _guard(cls)
+    _frozen.add(id(obj))
+    finalize(obj, _frozen.discard, id(obj))
+
+def decode_interned[T](cls: type, code: int, decode: Callable[[int], T]) -> T:
+    """returns the pooled object for (cls, code) or decodes, freezes and pools it.\n
+    Entries are weak references, so an object is evicted once nobody else holds it."""
+    global _hits, _misses
+    if not _enabled:
+        return decode(code)
+
+    key = (cls, code)
+    obj = _pool.get(key)
+    if obj is not None:
+        _hits += 1
+        return obj
+
+    _misses += 1
+    obj = decode(code)
+    _freeze(obj)
+    _pool[key] = obj
+    return obj
+
+def interned[T](decode: Callable[[type, int], T]) -> Callable[[type, int], T]:
+    """decorator for `decode(cls, code)` functions (apply below @classmethod)"""
+    @wraps(decode)
+    def wrapper(cls: type, code: int) -> T:
+        if not _enabled:
+            return decode(cls, code)
+        return decode_interned(cls, code, lambda c: decode(cls, c))
+    return wrapper
@@ -0,0 +1,178 @@
+"""Array versions of the functions in `pairing_bijections` (requires numpy).\n
+Inputs are arrays (or array-likes) of non-negative integers: int64/uint64 arrays,
+or object arrays of Python ints of any size.
+Elements whose inputs or intermediate results fit into 64 bits are computed vectorized in uint64;
+all others are computed exactly by the scalar functions of `pairing_bijections`.
+The result is a uint64 array if every element took the vectorized path, otherwise an object array of Python ints."""
+from math import prod
+from typing import Callable
+
+import numpy as np
+
+from pairing_bijections import (
+    f_to_flist,
+    fi_to_i,
+    flist_to_f,
+    i_to_fi,
+    pair_block,
+    pair_diagonal,
+    unpair_block,
+    unpair_diagonal
+    )
+
+UINT64_MAX = (1 << 64) - 1
+
+# ================================
+def as_words(a: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """returns (uint64 array with 0 where the value does not fit, mask of the values that fit)"""
+    if a.dtype.kind == "u":
+        return a.astype(np.uint64), np.ones(a.shape, dtype=bool)
+    if a.dtype.kind == "i":
+        if (a < 0).any():
+            raise ValueError("Pairing functions are only defined for non-negative integers!")
+        return a.astype(np.uint64), np.ones(a.shape, dtype=bool)
+    if a.dtype == object:
+        if (a < 0).astype(bool).any():
+            raise ValueError("Pairing functions are only defined for non-negative integers!")
+        fits = (a <= UINT64_MAX).astype(bool)
+        return np.where(fits, a, 0).astype(np.uint64), fits
+    raise TypeError(f"Expected an integer array, got dtype {a.dtype}!")
+
+def isqrt_words(v: np.ndarray) -> np.ndarray:
+    """floor(sqrt(v)) for uint64 v, corrected for the rounding of float64"""
+    m = np.minimum(np.floor(np.sqrt(v.astype(np.float64))), 2**32 - 1).astype(np.uint64)
+    for _ in range(2):
+        m -= (m * m > v).astype(np.uint64)
+    for _ in range(2):
+        m += ((m < 2**32 - 1) & ((m + 1) * (m + 1) <= v)).astype(np.uint64)
+    return m
+
+def dispatch(
+        fast: Callable[..., tuple[np.ndarray, ...]],
+        exact: Callable[..., tuple[int, ...]],
+        safe: Callable[..., np.ndarray],
+        *arrays
+        ) -> tuple[np.ndarray, ...]:
+    """applies `fast` (uint64) to the elements where `safe` holds and `exact` (Python ints) to the rest"""
+    arrays = np.broadcast_arrays(*(np.asarray(a) for a in arrays))
+    words, fits = zip(*(as_words(a) for a in arrays))
+    ok = np.logical_and.reduce(fits) & safe(*words)
+
+    if ok.all():
+        return fast(*words)
+
+    fast_results = fast(*(w[ok] for w in words))
+    outs = tuple(np.empty(arrays[0].shape, dtype=object) for _ in fast_results)
+    for out, res in zip(outs, fast_results):
+        out[ok] = res.astype(object)
+
+    bad = ~ok
+    exact_results = [exact(*map(int, vals)) for vals in zip(*(a[bad] for a in arrays))]
+    for out, res in zip(outs, zip(*exact_results)):
+        out[bad] = res
+    return outs
+
+
+# == Unendliche Paarungfunktionen ==
+def pair_diagonal_array(x, y) -> np.ndarray:
+    def fast(x, y):
+        s = x + y
+        return (s * (s - np.uint64(1)) // np.uint64(2) + y,)
+    def safe(x, y):
+        return (x < 2**31) & (y < 2**31)
+    return dispatch(fast, lambda x, y: (pair_diagonal(x, y),), safe, x, y)[0]
+
+def unpair_diagonal_array(z) -> tuple[np.ndarray, np.ndarray]:
+    def fast(z):
+        xpy = (isqrt_words(np.uint64(8) * z + np.uint64(1)) + np.uint64(1)) // np.uint64(2)
+        y = z - xpy * (xpy - np.uint64(1)) // np.uint64(2)
+        return xpy - y, y
+    def safe(z):
+        return z < 2**61
+    return dispatch(fast, unpair_diagonal, safe, z)
+
+def pair_block_array(x, y) -> np.ndarray:
+    def fast(x, y):
+        m = np.maximum(x, y)
+        rest = np.where(y == m, x, m + y + np.uint64(1))
+        return (m * m + rest,)
+    def safe(x, y):
+        return (x < 2**32) & (y < 2**32)
+    return dispatch(fast, lambda x, y: (pair_block(x, y),), safe, x, y)[0]
+
+def unpair_block_array(z) -> tuple[np.ndarray, np.ndarray]:
+    def fast(z):
+        m = isqrt_words(z)
+        rest = z - m * m
+        low = rest <= m
+        return np.where(low, rest, m), np.where(low, m, rest - m - np.uint64(1))
+    def safe(z):
+        return np.ones(z.shape, dtype=bool)
+    return dispatch(fast, unpair_block, safe, z)
+
+
+# == Einfache Funktionen =========
+def fi_to_i_array(x, y, *, m: int) -> np.ndarray:
+    """x[0...m-1], y[inf]<br>
+    returns z(x,y)[inf]"""
+    if np.any(np.asarray(x) >= m):
+        raise ValueError(f"All finite values must be smaller than m={m}!")
+    if m > UINT64_MAX:
+        # m*y only fits for y == 0
+        return dispatch(lambda x, y: (x,), lambda x, y: (fi_to_i(x, y, m=m),), lambda x, y: y == 0, x, y)[0]
+
+    m_word = np.uint64(m)
+    def fast(x, y):
+        return (m_word * y + x,)
+    def safe(x, y):
+        return y <= (np.uint64(UINT64_MAX) - x) // m_word
+    return dispatch(fast, lambda x, y: (fi_to_i(x, y, m=m),), safe, x, y)[0]
+
+def i_to_fi_array(z, *, m: int) -> tuple[np.ndarray, np.ndarray]:
+    """m: max for the fin number<br>
+    returns: num[0...m-1], rest[inf]"""
+    def exact(z):
+        return i_to_fi(z, m=m)
+    def safe(z):
+        return np.ones(z.shape, dtype=bool)
+    if m > UINT64_MAX:
+        return dispatch(lambda z: (z, np.zeros_like(z)), exact, safe, z)
+
+    m_word = np.uint64(m)
+    def fast(z):
+        num, rest = np.divmod(z, m_word)
+        return rest, num
+    return dispatch(fast, exact, safe, z)
+
+def flist_to_f_array(xs, *, maxes: list[int]) -> np.ndarray:
+    """xs: array of shape (..., len(maxes)); returns the codes of shape (...)"""
+    xs = np.asarray(xs)
+    assert xs.shape[-1] == len(maxes)
+    if np.any(xs >= np.array(maxes, dtype=object)):
+        raise ValueError(f"Digits exceed their maxima {maxes}!")
+
+    if prod(maxes) <= UINT64_MAX:
+        words, _ = as_words(xs)
+        multipliers = np.cumprod([1] + list(maxes[:-1]), dtype=np.uint64)
+        return (words * multipliers).sum(axis=-1, dtype=np.uint64)
+
+    rows = xs.reshape(-1, len(maxes))
+    codes = np.empty(len(rows), dtype=object)
+    codes[:] = [flist_to_f(list(map(int, row)), maxes=maxes) for row in rows]
+    return codes.reshape(xs.shape[:-1])
+
+def f_to_flist_array(z, *, maxes: list[int]) -> np.ndarray:
+    """returns the digits of z as array of shape (*z.shape, len(maxes)), see `f_to_flist`"""
+    z = np.asarray(z)
+    words, fits = as_words(z)
+
+    if fits.all() and max(maxes) <= UINT64_MAX:
+        digits = np.empty((*z.shape, len(maxes)), dtype=np.uint64)
+        for i, m in enumerate(maxes):
+            words, digits[..., i] = np.divmod(words, np.uint64(m))
+        return digits
+
+    digits = np.empty((*z.shape, len(maxes)), dtype=object)
+    for index, value in np.ndenumerate(z):
+        digits[index] = list(f_to_flist(int(value), length=len(maxes), maxes=maxes))
+    return digits
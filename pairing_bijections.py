@@ -1,6 +1,6 @@
 
-from itertools import chain
-from math import prod, sqrt, comb as binomial
+from itertools import chain, product
+from math import isqrt, prod, comb as binomial
 from typing import Iterable, Iterator
 
 from helpers import first_where, nacs, rev_enumerate, scan
@@ -31,6 +31,72 @@ def f_to_flist(z: int, *, length: int, maxes: Iterable[int]) -> Iterator[int]:
         yield res
 
 
+# == Abfragen über gemischte Basen ==
+def _free_below(maxes: list[int], fixed: dict[int, int]) -> list[int]:
+    """free_below[i]: number of digit combinations below position i that respect `fixed`"""
+    return list(scan(
+        lambda acc, im: acc * (1 if im[0] in fixed else im[1]),
+        enumerate(maxes),
+        acc=1,
+        yield_start=True))
+
+def _assert_fixed_digits(fixed: dict[int, int], maxes: list[int]):
+    assert all(0 <= i < len(maxes) for i in fixed)
+    assert all(0 <= d < maxes[i] for i, d in fixed.items())
+
+def count_fixed_digits(z: int, *, maxes: list[int], fixed: dict[int, int]) -> int:
+    """number of codes c in [0, z) whose digits (as in `f_to_flist`) at the positions
+    of `fixed` equal the given values; everything above prod(maxes) is unrestricted.\n
+    Runs in O(len(maxes)) big-int operations, regardless of the size of z"""
+    _assert_fixed_digits(fixed, maxes)
+    free_below = _free_below(maxes, fixed)
+    top, rest = divmod(z, prod(maxes))
+    digits = list(f_to_flist(rest, length=len(maxes), maxes=maxes))
+
+    count = top * free_below[-1]
+    for i in reversed(range(len(maxes))):
+        d = digits[i]
+        if i not in fixed:
+            count += d * free_below[i]
+            continue
+        if fixed[i] < d:
+            count += free_below[i]
+        if fixed[i] != d:
+            break
+    return count
+
+def next_fixed_digits(z: int, *, maxes: list[int], fixed: dict[int, int]) -> int:
+    """smallest code c >= z whose digits at the positions of `fixed` equal the given values"""
+    _assert_fixed_digits(fixed, maxes)
+    period = prod(maxes)
+    top, rest = divmod(z, period)
+    digits = list(f_to_flist(rest, length=len(maxes), maxes=maxes))
+
+    reset_below = 0
+    for i in reversed(range(len(maxes))):
+        if i not in fixed or digits[i] == fixed[i]:
+            continue
+        if digits[i] < fixed[i]:
+            digits[i] = fixed[i]
+            reset_below = i
+            break
+        # digit too large: carry into the lowest free position above that has room
+        carry_to = first_where(
+            lambda j: j not in fixed and digits[j] < maxes[j] - 1,
+            range(i+1, len(maxes)))
+        if carry_to is None:
+            top += 1
+            reset_below = len(maxes)
+        else:
+            digits[carry_to] += 1
+            reset_below = carry_to
+        break
+
+    for i in range(reset_below):
+        digits[i] = fixed.get(i, 0)
+    return top * period + flist_to_f(digits, maxes=maxes)
+
+
 
 # == Unendliche Paarungfunktionen ==
 def pair_diagonal(x: int, y: int) -> int:
@@ -39,8 +105,8 @@ def pair_diagonal(x: int, y: int) -> int:
 
 def unpair_diagonal(z: int) -> tuple[int, int]:
     """Unpairing function by Cantor"""
-    x_plus_y = 0.5 + sqrt(2*z + 0.25)
-    xpy = int(x_plus_y)
+    # largest xpy with xpy*(xpy-1)//2 <= z, i.e. int(0.5 + sqrt(2*z + 0.25)) without float rounding
+    xpy = (isqrt(8*z + 1) + 1) // 2
     y = z - xpy*(xpy-1) // 2
     x = xpy - y
     return x, y
@@ -51,27 +117,82 @@ def pair_block(x: int, y: int) -> int:
     rest = x if y == m else m + y + 1
     return m*m + rest
 
-def unpair_block(z: int) -> int:
-    m = int(sqrt(z))
+def unpair_block(z: int) -> tuple[int, int]:
+    m = isqrt(z)
     rest = z - m*m
     x, y = (rest, m) if rest <= m else (m, rest-m-1)
     return x, y
 
 
 # ================================
+# max. number of single steps down before the digit search switches to bisection
+# (fewer for small k, where binomial(m, k) is cheap to compute directly)
+DESCEND_STEPS = 1024
+
+def bisect_m(k: int, n: int, lo: int, hi: int) -> int:
+    """smallest m in (lo, hi] with binomial(m, k) > n,
+    given binomial(lo, k) <= n < binomial(hi, k)"""
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if binomial(mid, k) <= n:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
 def find_m(k: int, n: int) -> int:
-    # TODO: optimize search strategy
-    for m in range(k-1, k+n+1):
-        b = binomial(m, k)
-        if b > n:
-            return m
-
-def cantor_list_iter(kk: int, n: int):
-    for k in range(kk, 0, -1):
-        m = find_m(k, n)
-        d = m-1
-        n -= binomial(d, k)
+    """smallest m with binomial(m, k) > n (galloping search from k-1 upwards)"""
+    if k == 1:
+        return n + 1
+    if k == 2:
+        # largest d with d*(d-1)//2 <= n, plus one
+        return (isqrt(8*n + 1) + 1) // 2 + 1
+    lo = k-1 # binomial(k-1, k) = 0
+    step = 1
+    while binomial(lo + step, k) <= n:
+        lo += step
+        step *= 2
+    return bisect_m(k, n, lo, lo + step)
+
+def descend_m(k: int, n: int, d: int, b: int) -> tuple[int, int]:
+    """largest d' <= d with binomial(d', k) <= n, given b = binomial(d, k).\n
+    returns (d', binomial(d', k))"""
+    if k == 1:
+        return n, n
+    for _ in range(min(k, DESCEND_STEPS)):
+        if b <= n:
+            return d, b
+        # binomial(d-1, k) = binomial(d, k) * (d-k) / d
+        b = b * (d - k) // d
+        d -= 1
+    if b <= n:
+        return d, b
+
+    # gallop downwards, then bisect
+    hi, step = d, 1
+    while (lo := max(hi - step, k-1)) > k-1 and binomial(lo, k) > n:
+        hi = lo
+        step *= 2
+    d = bisect_m(k, n, lo, hi) - 1
+    return d, binomial(d, k)
+
+def cantor_list_iter(kk: int, n: int) -> Iterator[int]:
+    """yields the digits d_kk > ... > d_1 of n in the combinatorial number system
+    (n = sum of binomial(d_k, k)), largest first"""
+    if kk == 0:
+        return
+    k = kk
+    d = find_m(k, n) - 1
+    b = binomial(d, k)
+    while True:
         yield d
+        n -= b
+        if k == 1:
+            return
+        # binomial(d-1, k-1) = binomial(d, k) * k / d
+        b = b * k // d
+        d, k = d-1, k-1
+        d, b = descend_m(k, n, d, b)
 
 
 # ================================
@@ -109,17 +230,34 @@ def unmulti_recursive(z: int, *, number: int) -> Iterator[int]:
         yield el
     yield z
 
-def multi_cantor(xs: list[int]) -> int:
+def multi_cantor_counted(xs: Iterable[int]) -> tuple[int, int]:
+    """consumes the elements one by one; returns (code, number of elements)"""
     xs_acc = 0
     res_acc = 0
+    i = 0
     for i, x in enumerate(xs, start=1):
         xs_acc += x
         res_acc += binomial(xs_acc + i - 1, i)
-    return res_acc
+    return res_acc, i
+
+def multi_cantor(xs: Iterable[int]) -> int:
+    return multi_cantor_counted(xs)[0]
 
-def unmulti_cantor(z: int, *, length: int):
-    xs = list(cantor_list_iter(length, z))
-    return iset_to_ilist(xs[::-1])
+def iter_unmulti_cantor(z: int, *, length: int) -> Iterator[int]:
+    """yields the elements of `unmulti_cantor(z, length)` from the LAST to the first,
+    as they are peeled off the code"""
+    prev_d = None
+    for d in cantor_list_iter(length, z):
+        if prev_d is not None:
+            yield prev_d - d - 1
+        prev_d = d
+    if prev_d is not None:
+        yield prev_d
+
+def unmulti_cantor(z: int, *, length: int) -> list[int]:
+    xs = list(iter_unmulti_cantor(z, length=length))
+    xs.reverse()
+    return xs
 
 
 # ================================
@@ -145,13 +283,21 @@ def i_to_ii(z: int) -> tuple[int, int]:
     """returns: num[inf], rest[inf]"""
     return unpair_block(z)
 
-def ilist_to_i(lis: list[int]) -> int:
+def ilist_to_i(lis: Iterable[int]) -> int:
     return multi_cantor(lis)
 
+def ilist_to_i_counted(lis: Iterable[int]) -> tuple[int, int]:
+    """for iterators of unknown length: returns (code, length)"""
+    return multi_cantor_counted(lis)
+
 def i_to_ilist(z: int, *, length: int) -> list[int]:
     """uses up the number (gives no rest)"""
     return unmulti_cantor(z=z, length=length)
 
+def i_to_ilist_reversed(z: int, *, length: int) -> Iterator[int]:
+    """yields the elements of `i_to_ilist` in reverse order without building the list"""
+    return iter_unmulti_cantor(z=z, length=length)
+
 def iset_to_ilist(s: list[int]) -> list[int]:
     """set as finite list in sorted order"""
     return list(nacs(lambda prev_x, x: x-prev_x-1, s, x0=-1))
@@ -168,10 +314,57 @@ def ilist_to_iset(lis: list[int]) -> list[int]:
 # )
 
 def test_cantor(zmax = 10000000, length = 3):
+    """checks for all z < zmax that unmulti_cantor inverts multi_cantor (also when streamed)
+    and that the digit search agrees with a linear search over the binomials"""
+    def cantor_list_linear(kk: int, n: int) -> Iterator[int]:
+        for k in range(kk, 0, -1):
+            d = first_where(lambda m: binomial(m, k) > n, range(k-1, k+n+1)) - 1
+            n -= binomial(d, k)
+            yield d
+
     for z in range(zmax):
+        digits = list(cantor_list_iter(length, z))
+        if digits != list(cantor_list_linear(length, z)):
+            raise ValueError("The digit search does not agree with the linear search\n"
+                             f"at z = {z}, length = {length}: {digits}")
         lis = unmulti_cantor(z, length=length)
+        if list(i_to_ilist_reversed(z, length=length)) != lis[::-1]:
+            raise ValueError(f"The reversed decoding does not agree with unmulti_cantor at z = {z}")
         znew = multi_cantor(lis)
-        if z == znew:
+        if z == znew and multi_cantor_counted(iter(lis)) == (z, length):
             continue
         raise ValueError("The cantor ranking function does not agree with its inverse\n"
                          f"at z = {z}  f^-1(f(z)) = {znew}")
+
+def test_cantor_large(samples = 1000, bits = 256, lengths = range(1, 8), seed = 0):
+    """round trips of random codes with `bits` bits: since multi_cantor is injective,
+    multi_cantor(unmulti_cantor(z)) == z with non-negative elements means the decoding is right"""
+    from random import Random
+    rng = Random(seed)
+    for length in lengths:
+        for _ in range(samples):
+            z = rng.getrandbits(bits)
+            lis = unmulti_cantor(z, length=length)
+            if multi_cantor(lis) == z and all(x >= 0 for x in lis):
+                continue
+            raise ValueError("The cantor ranking function does not agree with its inverse\n"
+                             f"at z = {z}, length = {length}: {lis}")
+
+def test_fixed_digits(zmax = 1000, maxes = [2, 3, 4]):
+    """compares count_fixed_digits and next_fixed_digits with brute force
+    for every choice of fixed digits and every z <= zmax"""
+    period = prod(maxes)
+    all_digits = [list(f_to_flist(c % period, length=len(maxes), maxes=maxes)) for c in range(zmax + period)]
+
+    choices = [[None, *range(m)] for m in maxes]
+    for choice in product(*choices):
+        fixed = {i: d for i, d in enumerate(choice) if d is not None}
+        matches = [all(digits[i] == d for i, d in fixed.items()) for digits in all_digits]
+        count = 0
+        for z in range(zmax + 1):
+            if count_fixed_digits(z, maxes=maxes, fixed=fixed) != count:
+                raise ValueError(f"count_fixed_digits is wrong at z = {z} for fixed = {fixed}")
+            expected_next = first_where(lambda c: matches[c], range(z, len(matches)))
+            if next_fixed_digits(z, maxes=maxes, fixed=fixed) != expected_next:
+                raise ValueError(f"next_fixed_digits is wrong at z = {z} for fixed = {fixed}")
+            count += matches[z]